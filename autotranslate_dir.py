@@ -1,13 +1,17 @@
 from os import environ
 environ["ARGOS_DEVICE_TYPE"] = "cuda"
+# Limit allocator fragmentation. Both are read on first CUDA use.
+environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "max_split_size_mb:128")
+environ.setdefault("CT2_CUDA_CACHING_ALLOCATOR_CONFIG", "4,3,10,104857600")
 
 from pathlib import Path
 
 from ext_api.helpers import ensure_language
-from ext_api.translate import get_random_sequence
+from ext_api.translate import get_random_sequence, load_models
 from ext_api.parallel import translate_sequence_segmented
 
 lang = ensure_language("de")
+precision = "fp16"
 
 
 source = Path("files")
@@ -31,8 +35,8 @@ for target in source.iterdir():
         for l in sequence
     )
     print(sequence_str)
-    with target.open(encoding="ansi") as file:
-        query = file.read()
+    load_models(sequence, "cuda", precision)
+    query = target.read_text(encoding="ansi")
 
     result = translate_sequence_segmented(
         query,
@@ -42,7 +46,5 @@ for target in source.iterdir():
     )
     
     with output.joinpath(target.name).open("w", encoding="utf-8") as file:
-        file.write(sequence_str)
-        file.write("\n\n")
-        file.write(result)
+        file.write(f"{sequence_str}\n\n{result}")
     print()
\ No newline at end of file
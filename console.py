@@ -4,13 +4,14 @@ from itertools import repeat
 from os import environ
 from pathlib import Path
 from sys import exit, stdin, stderr
+from threading import Lock
 from typing import Iterable
 from shutil import get_terminal_size
 
 from tqdm import tqdm
 
 from ext_api.helpers import ProgressCounter, ensure_language
-from ext_api.translate import get_random_sequence
+from ext_api.translate import get_random_sequence, load_models, PRECISIONS
 from ext_api.parallel import translate_sequence_segmented
 
 parser = ArgumentParser(
@@ -19,8 +20,7 @@ parser = ArgumentParser(
 )
 parser.add_argument(
     "--pool-size", "-P",
-    help="The maximum size of the used thread pool. Optimal value is calculated automatically. \
-        Too high or low values may result in significant slowdowns.",
+    help="Deprecated and ignored. Every translation of the sequence now runs on its own thread.",
     type=int,
 )
 parser.add_argument(
@@ -36,6 +36,14 @@ parser.add_argument(
     help="Whether to use hardware-acceleration. Note that this is not supported on all systems.",
     action="store_true"
 )
+parser.add_argument(
+    "--precision", "-p",
+    help="The precision to run the translation models at. If left unset, the compute type \
+        configured for ArgosTranslate (ARGOS_COMPUTE_TYPE) is used.\
+        Lower precisions are significantly faster on GPUs, but may reduce translation quality.",
+    choices=tuple(PRECISIONS),
+    default=None
+)
 parser.add_argument(
     "--input", "-i",
     help="The source file to read query from. If left unset, data is read from stdin.\
@@ -108,36 +116,55 @@ jamble_translate.add_argument(
 )
 
 
+_progress_bar: tqdm|None = None
+_progress_bar_source: ProgressCounter|None = None
+_progress_bar_lock = Lock()
+
 def progress_callback(progress: ProgressCounter):
-    tqdm(
-        total=progress.end,
-        bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt}",
-    ).update(progress.state)
+    global _progress_bar, _progress_bar_source
+    with _progress_bar_lock:
+        if _progress_bar is None:
+            _progress_bar = tqdm(
+                total=progress.end,
+                bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt}",
+            )
+        elif progress is not _progress_bar_source:
+            _progress_bar.reset(total=progress.end)
+        _progress_bar_source = progress
+        _progress_bar.update(progress.state - _progress_bar.n)
+
+def close_progress_bar():
+    if _progress_bar is not None:
+        _progress_bar.close()
 
 def iterate_through_files(path: Path):
     for subpath in filter(lambda p: p.is_file(), path.iterdir()):
-        with subpath.open("r", encoding="utf-8") as file:
-            yield file.read()
+        yield subpath.read_text(encoding="utf-8")
 
 def iterate_new_file_objects(destination: Path, pattern: Path):
     for p in pattern.iterdir():
         path = destination / p.name
-        file = path.open("w", encoding="utf-8")
-        yield file
-        file.close()
+        with path.open("w", encoding="utf-8") as file:
+            yield file
 
 def repeat_file_object(source: Path):
-    while True:
-        with source.open("a", encoding="utf-8") as file:
+    with source.open("w", encoding="utf-8") as file:
+        while True:
             yield file
             file.write("\n\n")
+            file.flush()
 
 def main() -> int:
     namespace = parser.parse_args()
+    if namespace.pool_size is not None:
+        print("--pool-size is deprecated and has no effect", file=stderr)
+    device = "cuda" if namespace.gpu else "cpu"
     if namespace.gpu:
         environ["ARGOS_DEVICE_TYPE"] = "cuda"
+        # Limit allocator fragmentation. Both are read on first CUDA use.
+        environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "max_split_size_mb:128")
+        environ.setdefault("CT2_CUDA_CACHING_ALLOCATOR_CONFIG", "4,3,10,104857600")
     segment_length: int = namespace.segment_size
-    pool_size: int|None = namespace.pool_size
     input_path: Path|None = namespace.input
     output_path: Path|None = namespace.output
     silent: int = namespace.silent
@@ -155,10 +182,9 @@ def main() -> int:
     elif namespace.subparser == "jamble":
         try:
             source_lang = ensure_language(namespace.from_)
-            disabled_languages = [
-                ensure_language(code)
-                for code in namespace.except_
-            ]
+            disabled_codes = frozenset(namespace.except_)
+            for code in disabled_codes:
+                ensure_language(code)  # Only validates the code
         except ValueError as e:
             print(e, file=stderr)
             return 103
@@ -166,7 +192,7 @@ def main() -> int:
             source_lang,
             source_lang,
             namespace.translations,
-            disabled_languages=disabled_languages,
+            disabled_languages=disabled_codes,
             allow_self_translation=namespace.allow_self_translation
         )
         if silent < 2:
@@ -174,6 +200,7 @@ def main() -> int:
     else:
         print(NotImplementedError("Unknown action"), file=stderr)
         return 100
+    load_models(sequence, device, namespace.precision)
     
     # Setup IO
     queries: Iterable[str]
@@ -184,8 +211,7 @@ def main() -> int:
         queries = iterate_through_files(input_path)
         has_multiple_inputs = True
     else:
-        with input_path.open("r", encoding="utf-8") as file:
-            queries = (file.read(), )
+        queries = (input_path.read_text(encoding="utf-8"), )
 
     outputs: Iterable[TextIOWrapper|None]
     if output_path is None:
@@ -204,10 +230,13 @@ def main() -> int:
             query,
             sequence,
             max_segment_size=segment_length,
-            pool_size=pool_size,
             callback=progress_callback if silent == 0 else None
         )
-        print(result, file=output)
+        if output is None:
+            print(result)
+        else:
+            output.write(result)
+    close_progress_bar()
     return 0
 
 if __name__ == "__main__":
@@ -0,0 +1,126 @@
+# Numba-compiled kernels for ext_api.helpers.split_into_parts.
+# Importing this module raises ImportError if numba is not installed.
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def find_breaks(
+        lengths: np.ndarray,
+        joinable: np.ndarray,
+        target_length: int
+    ) -> np.ndarray:
+    """
+    Groups consecutive pieces into paragraphs of at most <target_length>.
+    Returns the indices at which paragraphs start, followed by the number
+    of pieces. Paragraphs may be empty.
+    """
+    breaks = np.empty(len(lengths) + 2, dtype=np.int64)
+    breaks[0] = 0
+    count = 1
+    length = 0
+    for i in range(len(lengths)):
+        if not joinable[i] or length + lengths[i] > target_length:
+            breaks[count] = i
+            count += 1
+            length = 0
+        length += lengths[i]
+    breaks[count] = len(lengths)
+    return breaks[:count + 1]
+
+
+MAX_TEXT_LENGTH = 2**31 - 1
+"""The longest text find_line_pieces can handle, as offsets are int32"""
+
+
+@njit(cache=True)
+def _is_line_break(char: int) -> bool:
+    # The ASCII characters str.splitlines breaks on
+    return char == 10 or char == 11 or char == 12 or char == 13 \
+        or 28 <= char <= 30
+
+
+@njit(cache=True)
+def _grow(array: np.ndarray) -> np.ndarray:
+    grown = np.empty(2*len(array), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+@njit(cache=True)
+def find_line_pieces(
+        buffer: np.ndarray,
+        target_length: int
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Byte-level version of ext_api.helpers._iter_line_pieces for ASCII text.
+    Returns the starts, ends and joinable flags of all pieces.
+    Lines are broken like str.splitlines does for ASCII characters.
+    """
+    size = len(buffer)
+    # Every line is one piece plus the pieces cut off of it.
+    # Two consecutive cuts cover at least target_length characters,
+    # so this is usually enough. The arrays grow if it is not.
+    line_breaks = 0
+    for i in range(size):
+        if _is_line_break(buffer[i]):
+            line_breaks += 1
+    capacity = line_breaks + 2*(size // target_length) + 2
+    starts = np.empty(capacity, dtype=np.int32)
+    ends = np.empty(capacity, dtype=np.int32)
+    joinable = np.empty(capacity, dtype=np.bool_)
+    count = 0
+    position = 0
+    while position < size:
+        start = position
+        end = position
+        while end < size:
+            char = buffer[end]
+            end += 1
+            if _is_line_break(char):
+                if char == 13 and end < size and buffer[end] == 10:  # \r\n
+                    end += 1
+                break
+        position = end
+        while True:
+            if end - start > target_length:
+                cut = start + target_length
+                while cut > start and buffer[cut] != 32:  # space
+                    cut -= 1
+                if cut == start:
+                    piece_end = next_start = start + target_length
+                else:
+                    piece_end = cut
+                    next_start = cut + 1
+                piece_joinable = False
+            else:
+                piece_end = next_start = end
+                piece_joinable = True
+            if count == len(starts):
+                starts = _grow(starts)
+                ends = _grow(ends)
+                joinable = _grow(joinable)
+            starts[count] = start
+            ends[count] = piece_end
+            joinable[count] = piece_joinable
+            count += 1
+            if piece_joinable:
+                break
+            start = next_start
+    return starts[:count], ends[:count], joinable[:count]
+
+
+def split_ascii(
+        text: str,
+        target_length: int
+    ) -> tuple[list[int], list[int], list[int]]:
+    """
+    Finds the pieces of an ASCII text and the breaks between its paragraphs.
+    Returns the starts and ends of all pieces and the paragraph breaks.
+    """
+    starts, ends, joinable = find_line_pieces(
+        np.frombuffer(text.encode("ascii"), dtype=np.uint8),
+        target_length
+    )
+    breaks = find_breaks(ends - starts, joinable, target_length)
+    return starts.tolist(), ends.tolist(), breaks.tolist()
@@ -1,9 +1,33 @@
+from collections.abc import Iterator, Sequence, Sized
+from functools import cache
+from itertools import pairwise
+from sys import intern
+from threading import Lock
+from time import monotonic
+from types import ModuleType
 from typing import Callable, Self
 
 from argostranslate.translate import get_installed_languages, Language
 
 LanguageOrStr = Language|str
 
+_ASCII_MIN_LINES = 3_000_000
+"""
+ASCII inputs with fewer lines than this are split faster in Python
+than it takes to load the numba kernels.
+"""
+
+
+@cache
+def _get_languages_by_code() -> dict[str, Language]:
+    # get_installed_languages rebuilds the whole language graph
+    # (including unloaded translation models) on every call.
+    # Codes are interned so that comparing them against other
+    # interned codes (e.g. disabled languages) is an identity check.
+    languages = get_installed_languages()
+    for lang in languages:
+        lang.code = intern(lang.code)
+    return {lang.code: lang for lang in languages}
 
 def get_lang_from_code(code: str, /) -> Language:
     """
@@ -14,10 +38,9 @@ def get_lang_from_code(code: str, /) -> Language:
     + `ValueError`
         The code does not match any installed languages.
     """
-    langs = get_installed_languages()
     try:
-        return next(filter(lambda l: l.code == code,langs))
-    except StopIteration as e:
+        return _get_languages_by_code()[code]
+    except KeyError as e:
         raise ValueError(f"Invalid language code {code}") from e
 
 def ensure_language(lang_or_code: LanguageOrStr, /) -> Language:
@@ -55,42 +78,101 @@ def split_into_parts(text: str, target_length: int) -> list[str]:
     Splitting will attempt to seperate on linebreaks or whitespaces 
     if possible, but will split on arbitrary characters when required.
     """
-    paragraphs = [""]
-    parsable_lines = text.splitlines(keepends=True)
-    while len(parsable_lines) > 0:
-        current_line = parsable_lines.pop(0)
-        if len(current_line) + len(paragraphs[-1]) <= target_length:
-            paragraphs[-1] += current_line
-        elif len(current_line) <= target_length:
-            paragraphs.append(current_line)
-        else:
-            new_paragraph, remaining_segments = _join_up_to_length(
-                current_line.split(" "),
-                " ",
-                target_length
-            )
-            if len(new_paragraph) == 0:
-                paragraphs.append(current_line[:target_length])
-                parsable_lines.insert(0,current_line[target_length:])
-            else:
-                paragraphs.append(new_paragraph)
-                parsable_lines.insert(0," ".join(remaining_segments))
-    return paragraphs
-
-def _join_up_to_length(
-        segments: list[str], 
-        join_char: str,
-        length: int,
+    # Every line holds at least one character, so the length check
+    # rules out most inputs before any lines are counted.
+    if len(text) >= _ASCII_MIN_LINES and text.isascii() \
+        and text.count("\n") >= _ASCII_MIN_LINES \
+        and (kernels := _load_segment_kernels()) is not None \
+        and len(text) <= kernels.MAX_TEXT_LENGTH:
+        starts, ends, breaks = kernels.split_ascii(text, target_length)
+        paragraphs = (
+            _join_paragraph(text, starts, ends, first, stop)
+            for first, stop in pairwise(breaks)
+            if first != stop
+        )
+        return [paragraph for paragraph in paragraphs if len(paragraph) > 0]
+    return list(split_into_parts_iter(text, target_length))
+
+@cache
+def _load_segment_kernels() -> ModuleType|None:
+    # Importing numba takes several hundred milliseconds, so it is only
+    # done once an input is large enough to make up for it.
+    try:
+        from ext_api import _segment_numba
+    except ImportError:
+        return None
+    return _segment_numba
+
+def split_into_parts_iter(text: str, target_length: int) -> Iterator[str]:
+    """
+    Splits a given string like `split_into_parts`, but yields every
+    segment as soon as it is complete instead of splitting the whole
+    text up front.
+    """
+    # Streaming version of ext_api._segment_numba.find_breaks
+    starts: list[int] = []
+    ends: list[int] = []
+    length = 0
+    for start, end, joinable in _iter_line_pieces(text, target_length):
+        if not joinable or length + end - start > target_length:
+            if length > 0:
+                yield _join_paragraph(text, starts, ends, 0, len(starts))
+            starts = []
+            ends = []
+            length = 0
+        starts.append(start)
+        ends.append(end)
+        length += end - start
+    if length > 0:
+        yield _join_paragraph(text, starts, ends, 0, len(starts))
+
+def _join_paragraph(
+        text: str,
+        starts: Sequence[int],
+        ends: Sequence[int],
+        first: int,
+        stop: int,
+        /
+    ) -> str:
+    # Puts the pieces first to stop (exclusive) together into a paragraph.
+    # Only the first piece of a paragraph can be followed by a gap
+    last = stop - 1
+    if first < last and ends[first] != starts[first + 1]:
+        return text[starts[first]:ends[first]] + text[starts[first + 1]:ends[last]]
+    return text[starts[first]:ends[last]]
+
+def _iter_line_pieces(
+        text: str,
+        target_length: int,
         /
-    ) -> tuple[str, list[str]]:
-    """"""
-    result = ""
-    used_join_char = ""
-    while len(segments) > 0 \
-        and len(result) + len(used_join_char) + len(segments[0]) <= length:
-        result += used_join_char + segments.pop(0)
-        used_join_char = join_char
-    return result, segments
+    ) -> Iterator[tuple[int, int, bool]]:
+    # Yields (start, end, joinable) for every line of text.
+    # Lines longer than target_length are split on the last fitting
+    # whitespace (which is dropped) or cut off if there is none.
+    # Only the remainder of such a line may join the preceding paragraph,
+    # so a paragraph has at most one gap, right after its first piece.
+    position = 0
+    for line in text.splitlines(keepends=True):
+        start, end = position, position + len(line)
+        position = end
+        while end - start > target_length:
+            cut = text.rfind(" ", start, start + target_length + 1)
+            if cut <= start:
+                yield start, start + target_length, False
+                start += target_length
+            else:
+                yield start, cut, False
+                start = cut + 1
+        yield start, end, True
+
+def length_order(items: Sequence[Sized], /) -> list[int]:
+    """
+    Returns the indices of <items> ordered by the length of the item
+    they point to, shortest first.
+    Dispatching work in this order keeps similarly sized inputs together,
+    which reduces the padding needed when they end up in the same batch.
+    """
+    return sorted(range(len(items)), key=lambda i: len(items[i]))
 
 
 class ProgressCounter:
@@ -100,17 +182,35 @@ class ProgressCounter:
         /,
         end: int|None=None,
         *,
-        callback: Callable[[Self], None]|None=None
+        callback: Callable[[Self], None]|None=None,
+        min_interval: float=1/30
     ):
+        """
+        Counts progress towards <end>, reporting to <callback>.
+        The callback is invoked at most once every <min_interval> seconds,
+        but always when <end> is reached.
+        """
         self._counter = start
+        self._lock = Lock()
         self.end = end
         self._callback = callback
+        self._min_interval = min_interval
+        self._last_report = float("-inf")
     
     @property
-    def state(self):
+    def state(self) -> int:
         return self._counter
     
-    def increment(self):
-        self._counter += 1
-        if self._callback is not None:
-            self._callback(self)
\ No newline at end of file
+    def increment(self) -> None:
+        # Called from multiple translation threads at once
+        with self._lock:
+            self._counter += 1
+            now = monotonic()
+            report = self._callback is not None and (
+                self._counter == self.end
+                or now - self._last_report >= self._min_interval
+            )
+            if report:
+                self._last_report = now
+        if report:
+            self._callback(self)
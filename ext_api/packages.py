@@ -10,6 +10,8 @@ from argostranslate.package import (
     get_installed_packages
 )
 from concurrent.futures import ThreadPoolExecutor
+
+from ext_api.translate import invalidate_adjacency
 if TYPE_CHECKING:
     from argostranslate.package import AvailablePackage
     from pathlib import Path
@@ -53,6 +55,7 @@ def install_all_packages(
                 _install, 
                 packages
             )
+        invalidate_adjacency()
     return len(packages)
 
 def get_new_packages(path: "Path"=None) -> list["AvailablePackage"]:
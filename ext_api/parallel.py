@@ -1,15 +1,25 @@
-from collections.abc import Collection
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from queue import Queue
+from threading import Lock, Thread
 from typing import Callable
+from warnings import warn
 
-from argostranslate.translate import Language
+from argostranslate.translate import Language, ITranslation
 
 from ext_api.translate import (
     translate_sequenced,
     iterate_translate_sequence,
+    load_models,
     _translate_sequence_part
 )
-from ext_api.helpers import split_into_parts, ProgressCounter
+from ext_api.helpers import (
+    split_into_parts,
+    split_into_parts_iter,
+    length_order,
+    ProgressCounter
+)
 
 
 class PartiallyFailedTranslation(ExceptionGroup):
@@ -27,6 +37,10 @@ class PartiallyFailedTranslation(ExceptionGroup):
         obj = super().__new__(cls, message, excs)
         obj.results = results
         return obj
+    
+    def __init__(self, message: str, excs: list[Exception], results: list[str|None]):
+        # Keeps results out of args, which ExceptionGroup expects to be (message, excs)
+        super().__init__(message, excs)
 
 
 ProgressCallback = Callable[[ProgressCounter], None]
@@ -42,8 +56,25 @@ def _parallel_translate_task(
         progress.increment()
     return query
 
+def _translate_single(
+    query: str,
+    sequence: list[Language],
+    progress: ProgressCounter,
+    /
+) -> list[str]:
+    # Translates a lone query on the calling thread.
+    # Not worth starting any threads for, but fails the same way.
+    try:
+        return [_parallel_translate_task(query, sequence, progress)]
+    except Exception as e:
+        raise PartiallyFailedTranslation(
+            "Some or all attempts at translation failed",
+            [e],
+            [None]
+        ) from None
+
 def parallel_sequenced_translate(
-    queries: Collection[str],
+    queries: Sequence[str],
     sequence: list[Language],
     /, *,
     pool_size: int|None=None,
@@ -51,6 +82,7 @@ def parallel_sequenced_translate(
 ) -> list[str]:
     """
     Translates multiple queries in parallel through a sequence and returns the results in-order.
+    Queries are dispatched shortest first.
     
     Parameters
     ----------
@@ -76,12 +108,18 @@ def parallel_sequenced_translate(
     )
     if callback is not None:
         callback(progress)
+    if len(queries) == 1:
+        return _translate_single(queries[0], sequence, progress)
     
     with ThreadPoolExecutor(pool_size, "TranslationThread-") as pool:
-        futures = [
-            pool.submit(_parallel_translate_task, q, sequence, progress)
-            for q in queries
-        ]
+        futures = [None]*len(queries)
+        for i in length_order(queries):
+            futures[i] = pool.submit(
+                _parallel_translate_task,
+                queries[i],
+                sequence,
+                progress
+            )
         results = []
         exceptions = []
         for f in futures:
@@ -90,19 +128,118 @@ def parallel_sequenced_translate(
             except Exception as e:
                 results.append(None)
                 exceptions.append(e)
-        if len(exceptions) > 0:
-            # Passing more than two arguments is apparently illegal for exception groups >:(
-            eg = PartiallyFailedTranslation(
-                "Some or all attempts at translation failed",
-                exceptions,
-                results  # type: ignore
-            )
-            eg.results = results
-            raise eg
-        return [
-            f.result()
-            for f in futures
-        ]
+    if len(exceptions) > 0:
+        raise PartiallyFailedTranslation(
+            "Some or all attempts at translation failed",
+            exceptions,
+            results
+        )
+    return results
+
+
+def _translation_stage(
+    translation: ITranslation|None,
+    langs: tuple[Language, Language],
+    lock: Lock,
+    inbox: Queue[tuple[int, str]|None],
+    outbox: Queue[tuple[int, str]|None],
+    progress: ProgressCounter,
+    exceptions: list[Exception],
+    /
+) -> None:
+    # A single step of translate_sequence_pipelined.
+    # Passes translated queries on until it receives None.
+    # None is always passed on, otherwise the following stages never finish.
+    # Stages sharing a translation object take turns through <lock>,
+    # as translations are not safe to use from multiple threads.
+    try:
+        while (item := inbox.get()) is not None:
+            i, query = item
+            try:
+                with lock:
+                    query = _translate_sequence_part(query, translation, langs)
+                outbox.put((i, query))
+                progress.increment()
+            except Exception as e:
+                exceptions.append(e)
+    finally:
+        outbox.put(None)
+
+def translate_sequence_pipelined(
+    queries: Sequence[str],
+    sequence: list[Language],
+    /, *,
+    callback: ProgressCallback|None=None
+) -> list[str]:
+    """
+    Translates multiple queries through a sequence and returns the results in-order.
+    Unlike `parallel_sequenced_translate` every step of the sequence gets
+    its own thread, forming a pipeline. Queries are handed from one step
+    to the next as soon as they are done, so all steps of the sequence work
+    concurrently. Steps using the same translation take turns.
+    Queries enter the sequence shortest first to keep similarly
+    sized inputs together.
+    
+    Parameters
+    ----------
+    + `queries`
+        The queries to be translated.
+    + `sequence`
+        The translation sequence to execute through
+    
+    Raises
+    ------
+    + `PartiallyFailedTranslation`
+        Raised when one or more translations raised an exception themselves.
+        Queries that failed are not translated any further.
+        This is an `ExceptionGroup` subclass.
+    """
+    progress = ProgressCounter(
+        end=len(queries)*(len(sequence)-1),
+        callback=callback
+    )
+    if callback is not None:
+        callback(progress)
+    if len(queries) == 1:
+        return _translate_single(queries[0], sequence, progress)
+    
+    # Loading the models here keeps stages that share a model
+    # from loading it at the same time.
+    load_models(sequence)
+    exceptions = []
+    locks: dict[ITranslation|None, Lock] = {}
+    inbox = first_inbox = Queue()
+    stages = []
+    for translation, langs in iterate_translate_sequence(sequence):
+        outbox = Queue()
+        lock = locks.setdefault(translation, Lock())
+        stages.append(Thread(
+            target=_translation_stage,
+            args=(translation, langs, lock, inbox, outbox, progress, exceptions),
+            name=f"TranslationThread-{len(stages)}",
+            daemon=True
+        ))
+        inbox = outbox
+    for stage in stages:
+        stage.start()
+    
+    for i in length_order(queries):
+        first_inbox.put((i, queries[i]))
+    first_inbox.put(None)
+    results: list[str|None] = [None]*len(queries)
+    while (item := inbox.get()) is not None:
+        i, query = item
+        results[i] = query
+    for stage in stages:
+        stage.join()
+    
+    if len(exceptions) > 0:
+        raise PartiallyFailedTranslation(
+            "Some or all attempts at translation failed",
+            exceptions,
+            results
+        )
+    return results
 
 
 def translate_sequence_segmented(
@@ -114,11 +251,84 @@ def translate_sequence_segmented(
     pool_size: int|None=None,
     callback: ProgressCallback|None=None
 ) -> str:
+    if pool_size is not None:
+        warn(
+            "pool_size is ignored by translate_sequence_segmented"
+            " and will be removed",
+            DeprecationWarning,
+            stacklevel=2
+        )
     queries = split_into_parts(query, max_segment_size)
-    results = parallel_sequenced_translate(
-        queries,
-        sequence,
-        pool_size=pool_size,
-        callback=callback
-    )
-    return "".join(results)
\ No newline at end of file
+    # Repeated segments (boilerplate, blank paragraphs) are only translated once,
+    # unless there are too few of them to be worth the bookkeeping.
+    unique_queries = list(dict.fromkeys(queries))
+    if len(unique_queries) >= 0.9*len(queries):
+        results = translate_sequence_pipelined(
+            queries,
+            sequence,
+            callback=callback
+        )
+        return "".join(results)
+    
+    positions = {q: i for i, q in enumerate(unique_queries)}
+    try:
+        results = translate_sequence_pipelined(
+            unique_queries,
+            sequence,
+            callback=callback
+        )
+    except PartiallyFailedTranslation as e:
+        e.results = [e.results[positions[q]] for q in queries]
+        raise
+    return "".join(results[positions[q]] for q in queries)
+
+def translate_sequenced_long(
+    text: str,
+    sequence: list[Language],
+    /,
+    chunk_size: int,
+    *,
+    batch_size: int=16,
+    pool_size: int|None=None
+) -> str:
+    """
+    Translates a long text through a sequence in segments of at most
+    <chunk_size> characters.
+    The text is split while it is being translated: segments are handed to
+    a thread pool in batches of <batch_size> and the next batch is split off
+    while the previous one is translated. Only two batches are held at once.
+    
+    Parameters
+    ----------
+    + `text`
+        The text to be translated.
+    + `sequence`
+        The translation sequence to execute through
+    + `chunk_size`
+        The maximum length of a single segment.
+    + `batch_size`
+        The number of segments dispatched at once.
+    + `pool_size`
+        The maximum amount of parallel translations.
+    
+    Raises
+    ------
+    + `InvalidTranslationError`
+        The provided sequence is invalid (one of the translations is
+        unavailable).
+    + `TranslationFailedError`
+        A translation attempt failed due to a non-specific reason.
+    """
+    parts = split_into_parts_iter(text, chunk_size)
+    results: list[str] = []
+    with ThreadPoolExecutor(pool_size, "TranslationThread-") as pool:
+        pending: list[Future[str]] = []
+        while len(batch := list(islice(parts, batch_size))) > 0:
+            submitted = [
+                pool.submit(translate_sequenced, query, sequence)
+                for query in batch
+            ]
+            results.extend(f.result() for f in pending)
+            pending = submitted
+        results.extend(f.result() for f in pending)
+    return "".join(results)
@@ -1,13 +1,42 @@
 from typing import TypeVar, Self
-from collections.abc import Generator, Sequence
+from collections.abc import Collection, Generator
+from functools import lru_cache
+from itertools import pairwise
 from random import choice
+from sys import intern
 
-from argostranslate.translate import Language, ITranslation
+import ctranslate2
+from argostranslate import settings
+from argostranslate.translate import (
+    Language,
+    ITranslation,
+    CachedTranslation,
+    CompositeTranslation,
+    PackageTranslation
+)
 
-from ext_api.helpers import ensure_code, LanguageOrStr
+from ext_api.helpers import (
+    ensure_code,
+    get_lang_from_code,
+    LanguageOrStr,
+    _get_languages_by_code
+)
 
 Translation = TypeVar("Translation", bound=ITranslation)
 
+PRECISIONS = {
+    "fp32": "float32",
+    "fp16": "float16",
+    "int8": "int8_float16",
+}
+"""The CTranslate2 compute types for the precisions accepted by `load_models`"""
+
+_TRANSLATOR_CACHE: dict[tuple[str, str, str], ctranslate2.Translator] = {}
+"""Loaded models by (model path, device, compute type)"""
+
+_ADJACENCY: dict[Language, tuple[Language, ...]]|None = None
+"""The languages each installed language translates to. Built on first use."""
+
 class TranslationFailedError(RuntimeError):
     """
     An error occured while attempting to translate.
@@ -23,6 +52,8 @@ class TranslationFailedError(RuntimeError):
     + query: `str`
         The translation query.
     """
+    __slots__ = ("from_lang", "to_lang", "query")
+    
     def __init__(
             self, 
             from_lang: Language,
@@ -55,13 +86,14 @@ class InvalidTranslationError(TranslationFailedError):
     + query: `str`
         The translation query.
     """
+    __slots__ = ()
 
 def get_random_sequence(
         start: Language, 
         end: Language, 
         steps: int,
         *,
-        disabled_languages: Sequence[LanguageOrStr] = (),
+        disabled_languages: Collection[LanguageOrStr] = (),
         allow_self_translation: bool=True
     ) -> list[Language]:
     """
@@ -80,39 +112,116 @@ def get_random_sequence(
         The number of steps in the sequence. The starting language is
         not counted as one of these, however the ending is.
         In a translation this would be the number of translations.
-    """
-    disabled_languages_set = set(ensure_code(l) for l in disabled_languages)
-    next_nodes = [
-        t.to_lang
-        for t in start.translations_from
-        if t.to_lang.code not in disabled_languages_set
-    ]
-    if steps == 0:
-        if end in next_nodes:
-            return [end]
-        else:
-            raise KeyError(f"Cannot reach end {end} from {start}")
+    + disabled_languages: `Collection[Language|str]`
+        Languages or language codes that may not appear in the sequence
+        after <start>.
     
-    if not allow_self_translation:
-        try:
-            next_nodes.remove(start)
-        except ValueError: ...
-    while True:
-        try:
-            chosen_node = choice(next_nodes)
-        except IndexError as e:
-            raise KeyError(f"Encountered dead branch whilst generating random sequence") from e
-        try:
-            return [start] + get_random_sequence(
-                chosen_node,
-                end,
-                steps - 1,
-                disabled_languages=disabled_languages,
-                allow_self_translation=allow_self_translation
+    Raises
+    ------
+    + `ValueError`
+        <start> or <end> is not an installed language.
+    + `KeyError`
+        <end> cannot be reached from <start> in <steps> steps.
+    """
+    # The language graph is cached, so start and end have to be the
+    # cached objects for the same codes.
+    return _get_random_sequence(
+        get_lang_from_code(start.code),
+        get_lang_from_code(end.code),
+        steps,
+        frozenset(intern(ensure_code(l)) for l in disabled_languages),
+        allow_self_translation
+    )
+
+def _get_random_sequence(
+        start: Language,
+        end: Language,
+        steps: int,
+        disabled_codes: frozenset[str],
+        allow_self_translation: bool,
+        /
+    ) -> list[Language]:
+    reachable = _get_reachable_languages(
+        end,
+        steps,
+        disabled_codes,
+        allow_self_translation
+    )
+    if start not in reachable[steps]:
+        raise KeyError(f"Cannot reach end {end} from {start} in {steps} steps")
+    # Only languages that can still reach the end in time are chosen,
+    # so every choice leads to a valid sequence.
+    adjacency = _get_adjacency()
+    sequence = [start]
+    for remaining in reversed(range(steps)):
+        current = sequence[-1]
+        sequence.append(choice([
+            lang
+            for lang in adjacency[current]
+            if lang in reachable[remaining]
+                and lang.code not in disabled_codes
+                and (allow_self_translation or lang is not current)
+        ]))
+    return sequence
+
+@lru_cache(maxsize=64)
+def _get_reachable_languages(
+        end: Language,
+        steps: int,
+        disabled_codes: frozenset[str],
+        allow_self_translation: bool,
+        /
+    ) -> tuple[frozenset[Language], ...]:
+    # Element k contains the languages that can reach end in exactly k steps.
+    adjacency = _get_adjacency()
+    reachable = [frozenset((end,))]
+    for _ in range(steps):
+        reachable.append(frozenset(
+            lang
+            for lang, next_langs in adjacency.items()
+            if any(
+                next_lang in reachable[-1]
+                    and next_lang.code not in disabled_codes
+                    and (allow_self_translation or next_lang is not lang)
+                for next_lang in next_langs
             )
-        except KeyError:
-            next_nodes.remove(chosen_node)
-            continue
+        ))
+    return tuple(reachable)
+
+def _get_adjacency() -> dict[Language, tuple[Language, ...]]:
+    # The installed language graph. Looking up the targets of a language
+    # here avoids going through all of its translation objects.
+    global _ADJACENCY
+    if _ADJACENCY is None:
+        _ADJACENCY = {
+            lang: tuple(t.to_lang for t in lang.translations_from)
+            for lang in _get_languages_by_code().values()
+        }
+    return _ADJACENCY
+
+def invalidate_adjacency() -> None:
+    """
+    Discards all cached information about the installed languages,
+    so that changes to the installed packages are picked up.
+    Language objects obtained before this call should not be used
+    afterwards.
+    """
+    global _ADJACENCY
+    _ADJACENCY = None
+    _get_languages_by_code.cache_clear()
+    _get_reachable_languages.cache_clear()
+    _get_translation.cache_clear()
+    _cached_translate.cache_clear()
+
+@lru_cache(maxsize=4096)
+def _get_translation(
+        from_lang: Language,
+        to_lang: Language,
+        /
+    ) -> ITranslation|None:
+    # Language.get_translation scans all translations of from_lang.
+    # The language graph does not change, so every pair is only looked up once.
+    return from_lang.get_translation(to_lang)
 
 def iterate_translate_sequence(
         sequence: list[Language]
@@ -138,10 +247,90 @@ def iterate_translate_sequence(
         the translation is `None`.
     """
     return (
-        (from_lang.get_translation(to_lang), (from_lang, to_lang))
-        for from_lang, to_lang in zip(sequence[:-1],sequence[1:])
+        (_get_translation(from_lang, to_lang), (from_lang, to_lang))
+        for from_lang, to_lang in pairwise(sequence)
     )
 
+def _iter_package_translations(
+        translation: ITranslation
+    ) -> Generator[PackageTranslation, None, None]:
+    # Unwraps the translations backed by a model
+    if isinstance(translation, PackageTranslation):
+        yield translation
+    elif isinstance(translation, CachedTranslation):
+        yield from _iter_package_translations(translation.underlying)
+    elif isinstance(translation, CompositeTranslation):
+        yield from _iter_package_translations(translation.t1)
+        yield from _iter_package_translations(translation.t2)
+
+def _get_translator(
+        model_path: str,
+        device: str,
+        compute_type: str
+    ) -> ctranslate2.Translator:
+    # Every model is only loaded once, no matter how many translations use it.
+    # All translations of a sequence may run at the same time, so threading
+    # is left to ArgosTranslate's settings instead of giving every model
+    # all cores.
+    key = (model_path, device, compute_type)
+    translator = _TRANSLATOR_CACHE.get(key)
+    if translator is None:
+        translator = _TRANSLATOR_CACHE[key] = ctranslate2.Translator(
+            model_path,
+            device=device,
+            compute_type=compute_type,
+            inter_threads=settings.inter_threads,
+            intra_threads=settings.intra_threads
+        )
+    return translator
+
+def load_models(
+        sequence: list[Language],
+        /,
+        device: str|None=None,
+        precision: str|None=None
+    ) -> None:
+    """
+    Loads the models for all translations in a sequence.
+    ArgosTranslate otherwise loads them on first use, separately for every
+    translation and on whichever thread gets there first.
+    Models that have already been loaded are left as they are.
+    Translations backed by the same model share a single instance of it,
+    also across calls.
+
+    Parameters
+    ----------
+    + sequence: `list[Language]`
+        The language sequence whose models should be loaded.
+        Invalid translations in the sequence are skipped.
+    + device: `str|None`
+        The device to load the models onto, i.e. `"cpu"` or `"cuda"`.
+        Defaults to ArgosTranslate's configured device (`ARGOS_DEVICE_TYPE`).
+    + precision: `str|None`
+        One of the keys of `PRECISIONS`. Lower precisions are faster,
+        especially on GPUs with Tensor Cores, but may reduce quality.
+        Precisions the device does not support fall back to the
+        closest supported one.
+        Defaults to ArgosTranslate's configured compute type
+        (`ARGOS_COMPUTE_TYPE`).
+    """
+    if device is None:
+        device = settings.device
+    if precision is None:
+        compute_type = settings.compute_type
+    else:
+        compute_type = PRECISIONS[precision]
+    for translation, _ in iterate_translate_sequence(sequence):
+        if translation is None:
+            continue
+        for package_translation in _iter_package_translations(translation):
+            if package_translation.translator is None:
+                package_translation.translator = _get_translator(
+                    str(package_translation.pkg.package_path / "model"),
+                    device,
+                    compute_type
+                )
+
 def identify_invalid_sequence(
         sequence: list[Language]
     ) -> tuple[int, tuple[Language, Language]]|None:
@@ -160,10 +349,29 @@ def identify_invalid_sequence(
 
     `None` if no invalid translation was found.
     """
-    for i, (translation, langs) \
-        in enumerate(iterate_translate_sequence(sequence)):
-        if translation is None:
-            return i, langs
+    if len(sequence) == 2:
+        # Single translations are by far the most common
+        from_lang, to_lang = sequence
+        if _get_translation(from_lang, to_lang) is None:
+            return 0, (from_lang, to_lang)
+        return None
+    return next(
+        (
+            (i, langs)
+            for i, (translation, langs)
+            in enumerate(iterate_translate_sequence(sequence))
+            if translation is None
+        ),
+        None
+    )
+
+@lru_cache(maxsize=1024)
+def _cached_translate(translation: ITranslation, query: str, /) -> str:
+    # Translations are deterministic, so repeated queries (boilerplate, headers,
+    # short lines) only need to go through the model once.
+    # Each translation object belongs to exactly one (from, to) pair.
+    # Segments can be several KB each, which keeps the cache small.
+    return translation.translate(query)
 
 def _translate_sequence_part(
     query: str,
@@ -174,7 +382,7 @@ def _translate_sequence_part(
     if translation is None:
         raise InvalidTranslationError.from_tuple(langs, query) 
     try:
-        return translation.translate(query)
+        return _cached_translate(translation, query)
     except Exception as e:
         raise TranslationFailedError.from_tuple(langs, query) from e
 
@@ -206,10 +414,23 @@ def translate_sequenced(
     ------
     + `InvalidTranslationError`
         The provided sequence is invalid (one of the translations is
-        unavailable)
+        unavailable). The sequence is validated as it is translated,
+        so there is no need to call `identify_invalid_sequence` first.
     + `TranslationFailedError`
         A translation attempt failed due to a non-specific reason.
     """
-    for translation, langs in iterate_translate_sequence(sequence):
+    if len(sequence) == 2:
+        # Single translations are by far the most common
+        from_lang, to_lang = sequence
+        return _translate_sequence_part(
+            query,
+            _get_translation(from_lang, to_lang),
+            (from_lang, to_lang)
+        )
+    steps = [
+        (_get_translation(from_lang, to_lang), (from_lang, to_lang))
+        for from_lang, to_lang in pairwise(sequence)
+    ]
+    for translation, langs in steps:
         query = _translate_sequence_part(query, translation, langs)
     return query